@@ -1,39 +1,112 @@
+import asyncio
 import os
+import queue
+import shutil
 import sys
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from pathlib import Path
+from dataclasses import dataclass
+from typing import Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import threading
 
 # --- CONFIGURAÇÕES ADAPTADAS PARA ANIMEHUB (TAURI + SVELTEKIT) ---
 OUTPUT_FILENAME = "contexto_animehub.txt"
 MAX_FILE_SIZE_KB = 250  # Aumentado levemente para arquivos de regras de domínio complexas
+MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_KB * 1024
+READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)  # Leitura é I/O: a GIL é liberada
+SCAN_DRAIN_MS = 50  # intervalo entre consumos da fila do scan na thread do Tk
+SCAN_ROWS_PER_TICK = 2000
 
-IGNORE_DIRS = {
+# Nomes de pasta (um único componente) descartados em qualquer nível
+IGNORE_DIR_NAMES = frozenset({
     '.git', '.idea', '.vscode', '.venv', '__pycache__', 'venv', 'env',
     'node_modules', '.next', 'out', 'dist', 'build', 'target', # 'target' é essencial para Rust
     'public', 'static', 'storage', 'logs', 'assets', 'images', 'img', 
     'cov', 'coverage', '.backup_temp', '.github', 'fixtures', 'e2e',
-    'prisma/migrations', 'bin'
-}
+    'bin'
+})
 
-IGNORE_FILES = {
+# Caminhos relativos à raiz, comparados componente a componente
+IGNORE_DIR_PATHS = frozenset({
+    ('prisma', 'migrations'),
+})
+
+_IGNORE_FILES_LIST = (
     'pnpm-lock.yaml', 'package-lock.json', 'yarn.lock', 'bun.lockb', 'Cargo.lock',
     'projeto_completo.txt', 'contexto_animehub.txt', 'pack.py', '.DS_Store',
     'favicon.ico', 'next-env.d.ts', '.gitignore', 'LICENSE',
     '.env.local', '.env.example', 'requirements.txt',
-    'tsconfig.json', 'jsconfig.json', 'package-lock.json',
+    'tsconfig.json', 'jsconfig.json',
     'next.config.js', 'jest.config.js', 'playwright.config.js', 'postcss.config.js',
     '.eslintrc.json', '.prettierrc', '.browserslistrc', '.flake8',
     'tailwind.config.ts', 'check-deps.js', 'install.js', 'start.js'
-}
+)
+IGNORE_FILES = frozenset(_IGNORE_FILES_LIST)
+
+# As listas são mantidas à mão: validamos no import que não há duplicatas e que
+# nenhum nome contém separador (esses nunca casariam com entry.name)
+assert len(IGNORE_FILES) == len(_IGNORE_FILES_LIST), "IGNORE_FILES tem entradas duplicadas"
+assert not any('/' in n or '\\' in n for n in IGNORE_FILES | IGNORE_DIR_NAMES), \
+    "use IGNORE_DIR_PATHS para caminhos com mais de um componente"
 
 # Extensões cruciais para o ecossistema Rust/Svelte
-INCLUDE_EXTS = {
+INCLUDE_EXTS = frozenset({
     '.rs', '.svelte', '.ts', '.tsx', '.js', '.jsx',
     '.toml', '.json', '.sql', '.prisma',
     '.md', '.txt', '.css', '.html', '.sh'
-}
+})
+
+def _read_into(path, buf, start, size):
+    # Lê o arquivo direto na fatia buf[start:start + size]. Devolve quantos bytes
+    # ficaram na fatia e o que sobrou (arquivo cresceu desde o scan, ou mensagem de erro)
+    view = memoryview(buf)[start:start + size]
+    try:
+        with open(path, 'rb') as f:
+            n = 0
+            while n < size:
+                k = f.readinto(view[n:])
+                if not k:
+                    break
+                n += k
+            extra = f.read()
+    except Exception as e:
+        return 0, f"[ERRO AO LER ARQUIVO: {e}]".encode('utf-8')
+
+    # Normaliza as quebras de linha deste arquivo como o modo texto fazia. Fica
+    # restrito ao arquivo para um \r final nunca se juntar ao separador seguinte
+    if buf.find(b"\r", start, start + n) != -1 or b"\r" in extra:
+        data = (view[:n].tobytes() + extra).replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        n = min(len(data), size)
+        view[:n] = data[:n]
+        extra = data[n:]
+    return n, extra
+
+def _entry_sort_key(entry):
+    # Prioriza docs na árvore visual também
+    info = entry[1]
+    return (not info.is_dir, info.name.lower() != 'docs', info.name.lower())
+
+@dataclass
+class FileInfo:
+    """Dados de uma entrada capturados uma única vez durante o scan."""
+    path: str  # mesmo valor do item_id; nenhum Path é criado durante o scan
+    name: str
+    is_dir: bool
+    size_bytes: Optional[int]  # None quando o stat falhou
+    suffix_lower: str  # extensão já normalizada para lookup em INCLUDE_EXTS
+    is_valid: bool = False  # arquivo elegível para o "Auto Selecionar", decidido no scan
+
+    @property
+    def is_file(self):
+        # Equivale ao Path.is_file() de antes: link quebrado (stat falhou) não conta
+        return not self.is_dir and self.size_bytes is not None
+
+    @property
+    def icon(self):
+        return "📁" if self.is_dir else "📄"
 
 class ProjectPackerApp:
     def __init__(self, root):
@@ -41,8 +114,15 @@ class ProjectPackerApp:
         self.root.title("AnimeHub - LLM Context Packer")
         self.root.geometry("1100x850") # Corrigido de 11000 para 1100
         
-        self.tree_items = {}  # item_id -> Path
+        self.tree_items = {}  # item_id -> FileInfo
         self.check_states = {} # item_id -> bool
+        self.selected_count = 0 # arquivos marcados, mantido incrementalmente
+        self.selected_bytes = 0
+        self.pending_repaint = set() # item_ids com marcação desatualizada (pai fechado)
+        self.children_map = {} # item_id -> [child_ids], inclui o que ainda não está na árvore
+        self.lazy_dirs = set() # pastas cujo conteúdo ainda não foi inserido no Treeview
+        self.scan_root = "" # raiz do último scan; prefixo de todos os item_ids
+        self.scan_generation = 0 # incrementado a cada scan; callbacks de scans antigos se descartam
         
         self._setup_ui()
         self._start_scan()
@@ -90,6 +170,7 @@ class ProjectPackerApp:
 
         self.tree.bind("<Button-1>", self._on_tree_click)
         self.tree.bind("<space>", self._on_tree_space)
+        self.tree.bind("<<TreeviewOpen>>", self._on_tree_open)
 
         btm_frame = ttk.Frame(self.root, padding=10)
         btm_frame.pack(fill=tk.X)
@@ -111,99 +192,279 @@ class ProjectPackerApp:
             self.path_var.set(path)
             self._start_scan()
 
-    def _is_valid_file(self, full_path):
-        if full_path.name in IGNORE_FILES:
-            return False
-        if full_path.suffix.lower() not in INCLUDE_EXTS:
-            return False
-        try:
-            if full_path.stat().st_size > MAX_FILE_SIZE_KB * 1024:
-                return False
-        except OSError:
-            return False
-        return True
+    def _is_valid_file(self, info):
+        return (info.name not in IGNORE_FILES
+                and info.suffix_lower in INCLUDE_EXTS
+                and info.size_bytes is not None
+                and info.size_bytes <= MAX_FILE_SIZE_BYTES)
 
     def _start_scan(self):
+        # Invalida o scan anterior antes de tudo, inclusive se o novo caminho for inválido
+        self.scan_generation += 1
+        generation = self.scan_generation
         self.tree.delete(*self.tree.get_children())
         self.tree_items.clear()
         self.check_states.clear()
+        self.selected_count = 0
+        self.selected_bytes = 0
+        self.pending_repaint.clear()
+        self.children_map.clear()
+        self.lazy_dirs.clear()
         
         root_path = Path(self.path_var.get())
         if not root_path.exists():
             messagebox.showerror("Erro", "Caminho raiz não encontrado.")
             return
 
+        # Resolve links: fwalk(follow_symlinks=False) não lista nada se a raiz for um link
+        self.scan_root = os.path.realpath(root_path)
+        scan_queue = queue.Queue()
         self.lbl_stats.config(text="Escaneando diretórios...")
-        threading.Thread(target=self._run_scan, args=(root_path,), daemon=True).start()
+        threading.Thread(target=self._run_scan, args=(self.scan_root, scan_queue, generation), daemon=True).start()
+        self.root.after(SCAN_DRAIN_MS, self._drain_scan_queue, scan_queue, generation)
 
-    def _run_scan(self, root_path):
-        self._scan_and_insert_ordered(root_path, "")
-        self.root.after(0, lambda: self.lbl_stats.config(text="Escaneamento concluído."))
-        self.root.after(0, self._update_stats)
-
-    def _scan_and_insert_ordered(self, current_path, parent_id):
+    def _run_scan(self, root_path, scan_queue, generation):
+        # A thread só produz lotes (parent_id, entries) na fila; nenhuma chamada ao Tk aqui.
+        # Termina com None, ou com a exceção se o scan morreu no meio do caminho
         try:
-            # Prioriza docs na árvore visual também
-            entries = sorted(os.listdir(current_path), key=lambda x: (
-                not os.path.isdir(current_path / x), 
-                x.lower() != 'docs', 
-                x.lower()
-            ))
-        except PermissionError:
+            if hasattr(os, 'fwalk'):
+                self._scan_fwalk(root_path, scan_queue, generation)
+            else:
+                asyncio.run(self._scan_async(root_path, "", (), scan_queue, generation))
+        except Exception as e:
+            scan_queue.put(e)
+        else:
+            scan_queue.put(None)
+
+    def _is_ignored_dir(self, name, rel_parts):
+        return name in IGNORE_DIR_NAMES or rel_parts + (name,) in IGNORE_DIR_PATHS
+
+    def _make_info(self, full_path, name, is_dir, size):
+        suffix_lower = os.path.splitext(name)[1].lower()
+        info = FileInfo(full_path, name, is_dir, size, suffix_lower)
+        info.is_valid = not is_dir and self._is_valid_file(info)
+        return info
+
+    def _scan_fwalk(self, root_path, scan_queue, generation):
+        # POSIX: stat relativo ao fd da pasta (openat/fstatat), sem resolver o caminho inteiro
+        rel_parts_of = {root_path: ()}
+        # Pilha de (pasta, subpastas ainda esperadas) seguindo a ordem de descida do fwalk.
+        # Subpasta que o fwalk pula (link, sem permissão) nunca é visitada; ao perceber
+        # isso, enviamos um lote vazio para ela não ficar com o sentinela "..." na árvore
+        expected = []
+
+        def flush_skipped(dirpath):
+            parent = os.path.dirname(dirpath)
+            while expected and expected[-1][0] != parent:
+                for skipped in expected.pop()[1]:
+                    scan_queue.put((skipped, []))
+            if expected:
+                siblings = expected[-1][1]
+                while siblings and siblings[0] != dirpath:
+                    scan_queue.put((siblings.popleft(), []))
+                if siblings:
+                    siblings.popleft()
+
+        for dirpath, dirnames, filenames, dirfd in os.fwalk(root_path, follow_symlinks=False):
+            if generation != self.scan_generation:
+                return  # um novo scan começou; este resultado seria descartado
+            if dirpath != root_path:
+                flush_skipped(dirpath)
+            rel_parts = rel_parts_of.pop(dirpath)
+            parent_id = "" if dirpath == root_path else dirpath
+            entries = []
+
+            # Links para pastas também chegam em dirnames; o fwalk não os segue
+            # e eles ficam como pasta vazia, igual ao scan com scandir
+            kept_dirs = []
+            for name in dirnames:
+                # Podar dirnames impede o fwalk de descer na pasta
+                if self._is_ignored_dir(name, rel_parts): continue
+                kept_dirs.append(name)
+                full_path = os.path.join(dirpath, name)
+                rel_parts_of[full_path] = rel_parts + (name,)
+                entries.append((full_path, self._make_info(full_path, name, True, None)))
+            dirnames[:] = kept_dirs
+            expected.append((dirpath, deque(os.path.join(dirpath, name) for name in kept_dirs)))
+
+            for name in filenames:
+                size = None
+                try: size = os.stat(name, dir_fd=dirfd).st_size
+                except OSError: pass
+                full_path = os.path.join(dirpath, name)
+                entries.append((full_path, self._make_info(full_path, name, False, size)))
+
+            entries.sort(key=_entry_sort_key)
+            scan_queue.put((parent_id, entries))
+
+        # O que sobrou na pilha foi pulado depois da última pasta visitada
+        while expected:
+            for skipped in expected.pop()[1]:
+                scan_queue.put((skipped, []))
+
+    async def _scan_async(self, current_path, parent_id, rel_parts, scan_queue, generation):
+        # Sem fwalk (Windows): cada pasta é listada numa thread do executor padrão e as
+        # subpastas correm em paralelo, sobrepondo a latência (relevante em drives de rede)
+        if generation != self.scan_generation:
             return
+        entries, linked_dirs = await asyncio.to_thread(self._list_dir, current_path, rel_parts)
+        # O lote do pai entra na fila antes de qualquer lote dos filhos
+        scan_queue.put((parent_id, entries))
+        # Links para pastas aparecem como pasta vazia: não são seguidos (evita ciclos)
+        for item_id in linked_dirs:
+            scan_queue.put((item_id, []))
+        await asyncio.gather(*(
+            self._scan_async(item_id, item_id, rel_parts + (info.name,), scan_queue, generation)
+            for item_id, info in entries if info.is_dir and item_id not in linked_dirs
+        ))
+
+    def _list_dir(self, current_path, rel_parts):
+        # os.scandir reaproveita o tipo/stat do DirEntry (1 syscall por entrada)
+        entries = []
+        linked_dirs = set()
+        try:
+            with os.scandir(current_path) as it:
+                for entry in it:
+                    # Segue o link só para classificar; link para pasta nunca vira arquivo
+                    is_dir = entry.is_dir()
+                    # Poda antes de montar caminhos ou descer na pasta
+                    if is_dir and self._is_ignored_dir(entry.name, rel_parts):
+                        continue
+                    if is_dir and entry.is_symlink():
+                        linked_dirs.add(entry.path)
+                    size = None
+                    if not is_dir:
+                        try: size = entry.stat(follow_symlinks=True).st_size
+                        except OSError: pass
+                    entries.append((entry.path, self._make_info(entry.path, entry.name, is_dir, size)))
+        except OSError:
+            # Sem permissão, pasta removida durante o scan, falha do drive de rede...:
+            # a pasta fica com o que foi lido, como o fwalk faz, e o resto do scan segue
+            pass
 
-        for entry in entries:
-            if entry in IGNORE_DIRS: continue
-            
-            full_path = current_path / entry
-            is_dir = full_path.is_dir()
-            
-            item_id = self._sync_insert(parent_id, entry, full_path, is_dir)
-            
-            if is_dir:
-                self._scan_and_insert_ordered(full_path, item_id)
+        entries.sort(key=_entry_sort_key)
+        return entries, linked_dirs
 
-    def _sync_insert(self, parent_id, text, full_path, is_dir):
-        res = {"id": None}
-        event = threading.Event()
+    def _drain_scan_queue(self, scan_queue, generation):
+        if generation != self.scan_generation:
+            return  # fila de um scan anterior
 
-        def do_insert():
+        # Consome no máximo SCAN_ROWS_PER_TICK entradas por ciclo para não travar a UI
+        rows = 0
+        while rows < SCAN_ROWS_PER_TICK:
+            try:
+                batch = scan_queue.get_nowait()
+            except queue.Empty:
+                break
+            if batch is None:
+                self.lbl_stats.config(text="Escaneamento concluído.")
+                self._update_stats()
+                return
+            if isinstance(batch, Exception):
+                self.lbl_stats.config(text=f"Erro no escaneamento: {batch}")
+                return
+            self._merge_scan_batch(*batch)
+            rows += len(batch[1])
+
+        self.lbl_stats.config(text=f"Escaneando diretórios... {len(self.tree_items)} itens")
+        self.root.after(SCAN_DRAIN_MS, self._drain_scan_queue, scan_queue, generation)
+
+    def _merge_scan_batch(self, parent_id, entries):
+        # Tudo fica em memória; o Treeview só recebe linhas de pastas já abertas
+        # (ou da raiz) e o resto é inserido sob demanda quando a pasta é expandida
+        for item_id, info in entries:
+            self.tree_items[item_id] = info
+            self.check_states[item_id] = False
+        self.children_map[parent_id] = [item_id for item_id, _ in entries]
+
+        if parent_id in self.lazy_dirs:
+            if not entries:
+                # Pasta vazia: remove o sentinela para sumir o expansor
+                self.tree.delete(*self.tree.get_children(parent_id))
+                self.lazy_dirs.discard(parent_id)
+        elif not parent_id or self.tree.exists(parent_id):
+            # Raiz, ou pasta aberta pelo usuário antes de o conteúdo chegar
+            self._insert_children(parent_id)
+
+    def _insert_children(self, parent_id):
+        for item_id in self.children_map.get(parent_id, ()):
+            info = self.tree_items[item_id]
             size_str = ""
-            if not is_dir:
-                try: size_str = f"{full_path.stat().st_size / 1024:.1f} KB"
-                except: size_str = "Error"
+            if not info.is_dir:
+                size_str = f"{info.size_bytes / 1024:.1f} KB" if info.size_bytes is not None else "Error"
             
-            icon = "📁" if is_dir else "📄"
-            item_id = self.tree.insert(parent_id, "end", text=f" ⬜ {icon} {text}", values=(size_str, "Pasta" if is_dir else "Arquivo"))
-            self.tree_items[item_id] = full_path
-            self.check_states[item_id] = False
-            res["id"] = item_id
-            event.set()
-
-        self.root.after(0, do_insert)
-        event.wait()
-        return res["id"]
+            mark = "✅" if self.check_states[item_id] else "⬜"
+            self.tree.insert(parent_id, "end", iid=item_id, text=f" {mark} {info.icon} {info.name}", values=(size_str, "Pasta" if info.is_dir else "Arquivo"))
+            if info.is_dir and (item_id not in self.children_map or self.children_map[item_id]):
+                # Filho sentinela só para o Treeview desenhar o expansor (também
+                # enquanto o conteúdo da pasta ainda não chegou do scan)
+                self.tree.insert(item_id, "end", text="...")
+                self.lazy_dirs.add(item_id)
+        self.lazy_dirs.discard(parent_id)
 
     def _update_visual_check(self, item_id):
         state = self.check_states.get(item_id, False)
-        path = self.tree_items[item_id]
-        icon = "📁" if path.is_dir() else "📄"
+        info = self.tree_items[item_id]
         mark = "✅" if state else "⬜"
         
-        text = self.tree.item(item_id, "text")
-        clean_text = text.split(f" {icon} ")[-1]
-        
-        self.tree.item(item_id, text=f" {mark} {icon} {clean_text}")
+        # O rótulo é remontado a partir do FileInfo, sem ler o texto atual do Tk
+        self.tree.item(item_id, text=f" {mark} {info.icon} {info.name}")
+        self.pending_repaint.discard(item_id)
+
+    def _repaint_rows(self, item_id):
+        # Só as linhas já inseridas são visitadas: as visíveis são repintadas agora,
+        # as que estão sob pastas fechadas ficam para o <<TreeviewOpen>>
+        stack = [(item_id, True)]
+        while stack:
+            node, visible = stack.pop()
+            if node:
+                if visible:
+                    self._update_visual_check(node)
+                else:
+                    self.pending_repaint.add(node)
+
+            if node in self.lazy_dirs:
+                continue
+            children = self.children_map.get(node)
+            if children:
+                children_visible = visible and (not node or self.tree.item(node, "open"))
+                stack.extend((child, children_visible) for child in children)
 
     def _toggle_check_recursive(self, item_id, force_state=None):
         current_state = self.check_states.get(item_id, False)
         new_state = not current_state if force_state is None else force_state
         
-        self.check_states[item_id] = new_state
-        self._update_visual_check(item_id)
-        
-        for child in self.tree.get_children(item_id):
-            self._toggle_check_recursive(child, new_state)
+        # Pilha explícita sobre o mapa em memória: nenhuma chamada ao Tk aqui
+        stack = [item_id]
+        delta = 1 if new_state else -1
+        while stack:
+            node = stack.pop()
+            info = self.tree_items[node]
+            if info.is_file and self.check_states[node] != new_state:
+                self.selected_count += delta
+                self.selected_bytes += delta * info.size_bytes
+            self.check_states[node] = new_state
+            stack.extend(self.children_map.get(node, ()))
+
+        self._repaint_rows(item_id)
+
+    def _on_tree_open(self, event):
+        item_id = self.tree.focus()
+        if not item_id:
+            return
+        if item_id in self.lazy_dirs:
+            self.tree.delete(*self.tree.get_children(item_id))
+            self._insert_children(item_id)
+            return
+        if not self.pending_repaint:
+            return
+        stack = list(self.children_map.get(item_id, ()))
+        while stack:
+            node = stack.pop()
+            if node in self.pending_repaint:
+                self._update_visual_check(node)
+            if node not in self.lazy_dirs and self.children_map.get(node) and self.tree.item(node, "open"):
+                stack.extend(self.children_map[node])
 
     def _on_tree_click(self, event):
         region = self.tree.identify("region", event.x, event.y)
@@ -220,80 +481,141 @@ class ProjectPackerApp:
             self._update_stats()
 
     def auto_select_valid(self):
-        for item_id, path in self.tree_items.items():
-            if path.is_file() and self._is_valid_file(path):
+        for item_id, info in self.tree_items.items():
+            if info.is_valid and not self.check_states[item_id]:
                 self.check_states[item_id] = True
-                self._update_visual_check(item_id)
+                self.selected_count += 1
+                self.selected_bytes += info.size_bytes
+        self._repaint_rows("")
         self._update_stats()
 
     def _update_stats(self):
-        files = [p for i, p in self.tree_items.items() if self.check_states[i] and p.is_file()]
-        total_kb = sum(p.stat().st_size for p in files if p.exists()) / 1024
-        self.lbl_stats.config(text=f"Selecionados: {len(files)} arquivos | Tamanho Total: {total_kb:.1f} KB")
+        # Contadores mantidos a cada mudança de estado: O(1) por atualização
+        total_kb = self.selected_bytes / 1024
+        self.lbl_stats.config(text=f"Selecionados: {self.selected_count} arquivos | Tamanho Total: {total_kb:.1f} KB")
 
     def _generate_ascii_tree(self):
         lines = ["."]
-        def walk_tree(item_id, prefix=""):
-            children = self.tree.get_children(item_id)
-            for i, child_id in enumerate(children):
-                path = self.tree_items[child_id]
-                is_last = (i == len(children) - 1)
-                connector = "└── " if is_last else "├── "
-                
-                state_mark = "[X]" if self.check_states[child_id] else "[ ]"
-                if path.is_dir():
-                    state_mark = "DIR"
-                
-                lines.append(f"{prefix}{connector}{state_mark} {path.name}")
-                if path.is_dir():
-                    new_prefix = prefix + ("    " if is_last else "│   ")
-                    walk_tree(child_id, new_prefix)
-        walk_tree("")
+
+        def push_children(item_id, prefix):
+            children = self.children_map.get(item_id, ())
+            last = len(children) - 1
+            # Empilha ao contrário para desempilhar na ordem original
+            for i in range(last, -1, -1):
+                stack.append((children[i], prefix, i == last))
+
+        # DFS iterativa sobre o mapa em memória: nenhuma chamada ao Tk
+        stack = []
+        push_children("", "")
+        while stack:
+            child_id, prefix, is_last = stack.pop()
+            info = self.tree_items[child_id]
+            connector = "└── " if is_last else "├── "
+            
+            state_mark = "[X]" if self.check_states[child_id] else "[ ]"
+            if info.is_dir:
+                state_mark = "DIR"
+            
+            lines.append(f"{prefix}{connector}{state_mark} {info.name}")
+            if info.is_dir:
+                push_children(child_id, prefix + ("    " if is_last else "│   "))
         return "\n".join(lines)
 
-    def _generate_final_content(self):
-        root_dir = Path(self.path_var.get())
-        selected_files = [
-            path for i_id, path in self.tree_items.items() 
-            if self.check_states[i_id] and path.is_file()
-        ]
+    def _sorted_selected_files(self):
+        # item_ids são a raiz do scan + separador + caminho relativo: basta fatiar a string
+        prefix_len = len(os.path.join(self.scan_root, ""))
 
         # Lógica de Ordenação: DOCUMENTOS PRIMEIRO
-        def sort_key(p):
-            rel = p.relative_to(root_dir)
-            parts = [part.lower() for part in rel.parts]
+        # A chave é calculada uma única vez por arquivo (decorate-sort-undecorate)
+        decorated = []
+        for i_id, info in self.tree_items.items():
+            if not self.check_states[i_id] or not info.is_file:
+                continue
+            rel = i_id[prefix_len:]
+            rel_lower = rel.lower()
+            parts = rel_lower.split(os.sep)
             
             # 1. Prioridade máxima para a pasta 'docs'
             is_in_docs = 'docs' in parts
             # 2. Prioridade para arquivos de documentação na raiz (README, ARCHITECTURE, etc)
-            is_root_doc = len(parts) == 1 and rel.suffix.lower() in ['.md', '.txt']
+            is_root_doc = len(parts) == 1 and info.suffix_lower in ('.md', '.txt')
             
             # O Python ordena False antes de True, então usamos 0 para docs e 1 para o resto
             priority = 0 if (is_in_docs or is_root_doc) else 1
-            return (priority, str(rel).lower())
+            decorated.append((priority, rel_lower, info, rel))
 
-        sorted_files = sorted(selected_files, key=sort_key)
+        decorated.sort(key=lambda d: (d[0], d[1]))
+        return [(info, rel) for _, _, info, rel in decorated]
 
-        output = [
+    def _content_header(self, root_dir):
+        return "".join([
             f"=== PROJETO: {root_dir.name} ===\n",
             "=== ESTRUTURA VISUAL ===\n",
             self._generate_ascii_tree(),
             f"\n\n{'='*60}\n",
             "CONTEÚDO DOS ARQUIVOS (Ordenado: Docs -> Source)\n",
             f"{'='*60}\n"
-        ]
+        ])
 
-        for path in sorted_files:
-            rel_path = path.relative_to(root_dir)
-            output.append(f"\n--- FILE: {rel_path} ---\n")
+    def _generate_final_content(self):
+        root_dir = Path(self.scan_root)
+        sorted_files = self._sorted_selected_files()
+
+        # Layout: cabeçalho e, por arquivo, "--- FILE ---", corpo e "\n". O corpo
+        # tem uma fatia reservada com o tamanho do scan, preenchida pelas threads
+        header = self._content_header(root_dir).encode('utf-8')
+        layout = []  # (info, início do "--- FILE ---", início do corpo, bytes do "--- FILE ---")
+        total = len(header)
+        for info, rel_path in sorted_files:
+            file_header = f"\n--- FILE: {rel_path} ---\n".encode('utf-8')
+            layout.append((info, total, total + len(file_header), file_header))
+            total += len(file_header) + (info.size_bytes or 0) + 1
+
+        buf = bytearray(total)
+        view = memoryview(buf)
+        view[:len(header)] = header
+        for info, start, body, file_header in layout:
+            view[start:body] = file_header
+            end = body + (info.size_bytes or 0)
+            view[end:end + 1] = b"\n"
+
+        def read_slot(slot):
+            info, _, body, _ = slot
+            return _read_into(info.path, buf, body, info.size_bytes or 0)
+
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+            results = list(executor.map(read_slot, layout))
+
+        if all(n == (info.size_bytes or 0) and not extra
+               for (info, _, _, _), (n, extra) in zip(layout, results)):
+            data = buf
+        else:
+            # Algum arquivo mudou de tamanho ou falhou: remonta só as partes válidas
+            chunks = [view[:len(header)]]
+            for (info, start, body, _), (n, extra) in zip(layout, results):
+                chunks.append(view[start:body + n])
+                chunks.append(extra)
+                chunks.append(b"\n")
+            data = b"".join(chunks)
+
+        # Decodifica uma única vez; as quebras de linha já vêm normalizadas por arquivo
+        return data.decode('utf-8', errors='ignore')
+
+    def _write_final_content(self, out):
+        # Copia cada arquivo em blocos direto para o destino, sem montar o conteúdo
+        # inteiro em memória. A leitura em modo texto (utf-8, errors='ignore', quebras
+        # normalizadas) deixa o arquivo salvo igual ao texto copiado para o clipboard
+        root_dir = Path(self.scan_root)
+        out.write(self._content_header(root_dir))
+
+        for info, rel_path in self._sorted_selected_files():
+            out.write(f"\n--- FILE: {rel_path} ---\n")
             try:
-                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                    output.append(f.read())
-                output.append("\n")
+                with open(info.path, 'r', encoding='utf-8', errors='ignore') as src:
+                    shutil.copyfileobj(src, out)
             except Exception as e:
-                output.append(f"[ERRO AO LER ARQUIVO: {e}]\n")
-
-        return "".join(output)
+                out.write(f"[ERRO AO LER ARQUIVO: {e}]")
+            out.write("\n")
 
     def copy_to_clipboard(self):
         content = self._generate_final_content()
@@ -302,15 +624,14 @@ class ProjectPackerApp:
         messagebox.showinfo("Sucesso", "Contexto do AnimeHub copiado!")
 
     def save_file_as(self):
-        content = self._generate_final_content()
         target = filedialog.asksaveasfilename(
             defaultextension=".txt", 
             initialfile=OUTPUT_FILENAME,
             title="Salvar Contexto do Projeto"
         )
         if target:
-            with open(target, 'w', encoding='utf-8') as f:
-                f.write(content)
+            with open(target, 'w', encoding='utf-8', newline='\n') as f:
+                self._write_final_content(f)
             messagebox.showinfo("Sucesso", f"Salvo em:\n{target}")
 
 if __name__ == "__main__":